@@ -7,8 +7,10 @@ Manages environment variables, database connections, API settings, and operation
 """
 
 import os
+from functools import lru_cache
 from typing import Dict, Optional, Any
-from pydantic import BaseSettings, Field, validator
+from pydantic import Field, validator
+from pydantic_settings import BaseSettings  # version: 2.0.0
 from python_dotenv import load_dotenv  # version: 1.0.0
 
 from ..models.context import MIN_CONFIDENCE_SCORE, MAX_CONFIDENCE_SCORE
@@ -129,26 +131,15 @@ class Settings(BaseSettings):
             "health_check_interval": 30
         }
 
-    def validate_settings(self) -> bool:
-        """Validates all settings against security and operational requirements."""
-        try:
-            # Validate environment
-            self.validate_environment(self.ENV)
-            
-            # Validate MongoDB settings
-            self.validate_mongodb_uri(self.MONGODB_URI)
-            
-            # Validate Redis settings
-            self.validate_redis_password(self.REDIS_PASSWORD)
-            
-            # Validate confidence scores
-            self.validate_confidence_scores(self.MIN_CONFIDENCE_SCORE, {})
-            self.validate_confidence_scores(self.MAX_CONFIDENCE_SCORE, {})
-            
-            return True
-        except Exception as e:
-            raise ValueError(f"Settings validation failed: {str(e)}")
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance.
+
+    Construction already runs every field validator, so the instance is built
+    (and the .env file parsed) exactly once per process.
+    """
+    return Settings()
 
-# Create and validate settings instance
-settings = Settings()
-settings.validate_settings()
\ No newline at end of file
+# Shared instance for modules that import settings directly
+settings = get_settings()
\ No newline at end of file
@@ -10,6 +10,7 @@ import asyncio
 import logging
 import signal
 from contextlib import asynccontextmanager
+from datetime import timedelta
 from typing import Dict, Any
 
 from fastapi import FastAPI, Request, Response
@@ -17,22 +18,28 @@ from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient  # version: 3.3.1
 from redis import asyncio as aioredis  # version: 5.0.1
 from prometheus_client import Counter, Histogram, Gauge  # version: 0.17.1
+from prometheus_fastapi_instrumentator import Instrumentator  # version: 6.1.0
 from opentelemetry import trace  # version: 1.19.0
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor  # version: 0.41b0
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.resources import Resource
-from circuitbreaker import circuit  # version: 1.4.0
-from tenacity import retry, stop_after_attempt, wait_exponential  # version: 8.2.3
+from aiobreaker import CircuitBreaker  # version: 1.2.0
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential  # version: 8.2.3
+from fastapi_cache import FastAPICache  # version: 0.1.0
+from fastapi_cache.backends.redis import RedisBackend
 
-from .config.settings import Settings
+from .config.settings import get_settings
 from .routes import context_routes, health_routes
+from .services.analyzer import ContextAnalyzer
 from .middleware.logging import RequestLoggingMiddleware
 from .middleware.auth import AuthMiddleware
 from .middleware.error_handler import ErrorHandlerMiddleware
 
-# Initialize settings
-settings = Settings()
+# Initialize settings (cached; the same instance is shared across modules)
+settings = get_settings()
 
 # Initialize logging
 logging.basicConfig(
@@ -41,10 +48,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize metrics
-request_count = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
-request_latency = Histogram('http_request_duration_seconds', 'HTTP request latency')
-active_connections = Gauge('active_connections', 'Number of active connections')
+# Initialize metrics (HTTP request metrics come from the ASGI instrumentator)
 error_count = Counter('error_count_total', 'Total error count by type', ['error_type'])
 
 # Initialize FastAPI app
@@ -56,36 +60,43 @@ app = FastAPI(
     openapi_url="/api/openapi.json"
 )
 
-@circuit(failure_threshold=5, recovery_timeout=60)
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10)
-)
+# Async-aware circuit breakers; the sync circuitbreaker/tenacity decorators
+# do not await coroutines and block the loop during backoff sleeps
+mongodb_breaker = CircuitBreaker(fail_max=5, timeout_duration=timedelta(seconds=60))
+redis_breaker = CircuitBreaker(fail_max=3, timeout_duration=timedelta(seconds=30))
+
+@mongodb_breaker
 async def init_mongodb() -> AsyncIOMotorClient:
     """Initialize MongoDB connection with retry logic and connection pooling."""
-    mongo_settings = settings.get_mongodb_settings()
-    client = AsyncIOMotorClient(**mongo_settings)
-    # Verify connection
-    await client.admin.command('ping')
-    return client
-
-@circuit(failure_threshold=3, recovery_timeout=30)
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10)
-)
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10)
+    ):
+        with attempt:
+            mongo_settings = settings.get_mongodb_settings()
+            client = AsyncIOMotorClient(**mongo_settings)
+            # Verify connection
+            await client.admin.command('ping')
+            return client
+
+@redis_breaker
 async def init_redis() -> aioredis.Redis:
     """Initialize Redis connection with retry logic."""
-    redis_settings = settings.get_redis_settings()
-    client = await aioredis.from_url(
-        f"redis://{redis_settings['host']}:{redis_settings['port']}",
-        password=redis_settings['password'],
-        ssl=redis_settings['ssl'],
-        ssl_cert_reqs=redis_settings['ssl_cert_reqs']
-    )
-    # Verify connection
-    await client.ping()
-    return client
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10)
+    ):
+        with attempt:
+            redis_settings = settings.get_redis_settings()
+            client = await aioredis.from_url(
+                f"redis://{redis_settings['host']}:{redis_settings['port']}",
+                password=redis_settings['password'],
+                ssl=redis_settings['ssl'],
+                ssl_cert_reqs=redis_settings['ssl_cert_reqs']
+            )
+            # Verify connection
+            await client.ping()
+            return client
 
 async def init_telemetry() -> None:
     """Initialize OpenTelemetry with trace sampling and metrics."""
@@ -95,11 +106,19 @@ async def init_telemetry() -> None:
         "deployment.environment": settings.ENV
     })
     
-    trace.set_tracer_provider(TracerProvider(resource=resource))
+    # Parent-based 5% sampling keeps span volume (and OTLP serialization
+    # cost) bounded at high RPS while preserving full traces when sampled
+    trace.set_tracer_provider(TracerProvider(
+        resource=resource,
+        sampler=ParentBased(TraceIdRatioBased(0.05))
+    ))
     otlp_exporter = OTLPSpanExporter()
     span_processor = BatchSpanProcessor(otlp_exporter)
     trace.get_tracer_provider().add_span_processor(span_processor)
 
+    # Auto-instrument routes at the ASGI layer instead of per-endpoint decorators
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="api/health,metrics")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle with graceful startup and shutdown."""
@@ -109,7 +128,39 @@ async def lifespan(app: FastAPI):
         app.state.mongodb = await init_mongodb()
         app.state.redis = await init_redis()
         await init_telemetry()
-        
+
+        # Build the analyzer once per worker, sharing the pooled async clients
+        analyzer = ContextAnalyzer()
+        analyzer.attach_storage(
+            mongodb_collection=app.state.mongodb[settings.APP_NAME].contexts,
+            redis_client=app.state.redis
+        )
+        app.state.analyzer = analyzer
+
+        # Warm the pooled sockets in parallel so the first traffic burst does
+        # not pay per-connection TLS handshakes, then prime the analyzer so
+        # tokenizer/model initialization happens before live requests
+        await asyncio.gather(
+            *(app.state.mongodb.admin.command('ping')
+              for _ in range(settings.MONGODB_POOL_SIZE)),
+            *(app.state.redis.ping() for _ in range(16))
+        )
+        try:
+            await analyzer.analyze_email(
+                email_id="warmup",
+                content="warmup",
+                thread_id="warmup"
+            )
+        except Exception as e:
+            logger.warning(f"Analyzer warmup failed (non-fatal): {str(e)}")
+
+        # Response cache keyed on request bodies so distinct emails never collide
+        FastAPICache.init(
+            RedisBackend(app.state.redis),
+            prefix="ctx",
+            key_builder=context_routes.request_body_key_builder
+        )
+
         logger.info("Context Engine service initialized successfully")
         yield
     except Exception as e:
@@ -142,22 +193,12 @@ app.add_middleware(ErrorHandlerMiddleware)
 app.include_router(health_routes.router, prefix="/api/health", tags=["Health"])
 app.include_router(context_routes.router, prefix="/api/v1/context", tags=["Context"])
 
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next) -> Response:
-    """Collect metrics for each request."""
-    active_connections.inc()
-    
-    with request_latency.time():
-        response = await call_next(request)
-        
-    request_count.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
-    
-    active_connections.dec()
-    return response
+# HTTP metrics via a single ASGI-level middleware; grouped status codes keep
+# label cardinality bounded and /metrics is exposed automatically
+Instrumentator(
+    should_group_status_codes=True,
+    excluded_handlers=["/api/health.*", "/metrics"]
+).instrument(app).expose(app)
 
 def handle_shutdown(signal_type: signal.Signals) -> None:
     """Handle graceful shutdown on system signals."""
@@ -176,6 +217,11 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         workers=4,
+        loop="uvloop",
+        http="httptools",
+        backlog=2048,
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
         log_level=settings.LOG_LEVEL.lower(),
         reload=settings.ENV == "development",
         lifespan="on"
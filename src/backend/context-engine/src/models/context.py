@@ -6,24 +6,48 @@ Implements the context.proto definitions with enhanced business logic and type s
 @author: AI Email Management Platform Team
 """
 
-from dataclasses import dataclass, field
 from datetime import datetime
 import enum
-from typing import Dict, List, Optional, Any, Union
-import uuid
+import operator
+from typing import Annotated, Dict, List, Optional, Any, Union
 import re
-from pydantic import BaseModel, EmailStr, validator, Field
-from pydantic.dataclasses import dataclass as pydantic_dataclass
+import sys
+import msgspec  # version: 0.18+
+import orjson  # version: 3.9+
 
 from ..shared.proto import context_pb2
-from google.protobuf.timestamp_pb2 import Timestamp
+from google.protobuf.json_format import ParseDict
 
 # Constants for validation
 MIN_CONFIDENCE_SCORE = 0.0
 MAX_CONFIDENCE_SCORE = 1.0
 MAX_TOPICS = 10
-REQUIRED_METADATA_FIELDS = ['source', 'version', 'timestamp']
-EMAIL_REGEX = re.compile(r"[^@]+@[^@]+\.[^@]+")
+# Interned hot keys compare by pointer identity on dict lookups
+REQUIRED_METADATA_FIELDS = [sys.intern(s)
+                            for s in ('source', 'version', 'timestamp')]
+_EXT_PAYLOAD_KEY = sys.intern("ext_payload")
+# frozenset.difference(dict) runs the whole membership check in one C call
+_REQUIRED_METADATA_SET = frozenset(REQUIRED_METADATA_FIELDS)
+# Email validation compiles to a linear-time DFA under re2 when available;
+# CPython's NFA engine can backtrack on the greedy [^@]+ groups for
+# malformed inputs. The pattern is identical either way.
+try:
+    import re2 as _re_engine  # version: 1.0+ (google-re2)
+except ImportError:
+    _re_engine = re
+EMAIL_REGEX = _re_engine.compile(r"^[^@]+@[^@]+\.[^@]+$")
+# Validates a v4 UUID literal in one C-level regex pass; constructing
+# uuid.UUID(..., version=4) per field costs ~20 Python ops per call
+_UUID4_RE = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}\Z',
+    re.I
+)
+
+# Constrained field aliases; msgspec enforces these in compiled code whenever
+# instances are decoded or converted, replacing pydantic's per-field validators
+ConfidenceScore = Annotated[float, msgspec.Meta(ge=MIN_CONFIDENCE_SCORE,
+                                                le=MAX_CONFIDENCE_SCORE)]
+FrequencyScore = Annotated[float, msgspec.Meta(ge=0.0, le=1.0)]
 
 @enum.unique
 class ProjectStatus(enum.Enum):
@@ -36,23 +60,11 @@ class ProjectStatus(enum.Enum):
     @classmethod
     def from_proto(cls, status: context_pb2.ProjectStatus) -> 'ProjectStatus':
         """Convert proto enum to ProjectStatus."""
-        status_map = {
-            context_pb2.PROJECT_STATUS_ACTIVE: cls.ACTIVE,
-            context_pb2.PROJECT_STATUS_COMPLETED: cls.COMPLETED,
-            context_pb2.PROJECT_STATUS_ON_HOLD: cls.ON_HOLD,
-            context_pb2.PROJECT_STATUS_ARCHIVED: cls.ARCHIVED
-        }
-        return status_map.get(status, cls.ACTIVE)
+        return _PROJECT_STATUS_FROM_PROTO.get(status, cls.ACTIVE)
 
     def to_proto(self) -> context_pb2.ProjectStatus:
         """Convert to proto enum."""
-        status_map = {
-            self.ACTIVE: context_pb2.PROJECT_STATUS_ACTIVE,
-            self.COMPLETED: context_pb2.PROJECT_STATUS_COMPLETED,
-            self.ON_HOLD: context_pb2.PROJECT_STATUS_ON_HOLD,
-            self.ARCHIVED: context_pb2.PROJECT_STATUS_ARCHIVED
-        }
-        return status_map[self]
+        return _PROJECT_STATUS_TO_PROTO[self]
 
 @enum.unique
 class RelationshipType(enum.Enum):
@@ -65,67 +77,80 @@ class RelationshipType(enum.Enum):
     @classmethod
     def from_proto(cls, type_: context_pb2.RelationshipType) -> 'RelationshipType':
         """Convert proto enum to RelationshipType."""
-        type_map = {
-            context_pb2.RELATIONSHIP_TYPE_TEAM_MEMBER: cls.TEAM_MEMBER,
-            context_pb2.RELATIONSHIP_TYPE_STAKEHOLDER: cls.STAKEHOLDER,
-            context_pb2.RELATIONSHIP_TYPE_CLIENT: cls.CLIENT,
-            context_pb2.RELATIONSHIP_TYPE_VENDOR: cls.VENDOR
-        }
-        return type_map.get(type_, cls.TEAM_MEMBER)
+        return _RELATIONSHIP_TYPE_FROM_PROTO.get(type_, cls.TEAM_MEMBER)
 
     def to_proto(self) -> context_pb2.RelationshipType:
         """Convert to proto enum."""
-        type_map = {
-            self.TEAM_MEMBER: context_pb2.RELATIONSHIP_TYPE_TEAM_MEMBER,
-            self.STAKEHOLDER: context_pb2.RELATIONSHIP_TYPE_STAKEHOLDER,
-            self.CLIENT: context_pb2.RELATIONSHIP_TYPE_CLIENT,
-            self.VENDOR: context_pb2.RELATIONSHIP_TYPE_VENDOR
-        }
-        return type_map[self]
+        return _RELATIONSHIP_TYPE_TO_PROTO[self]
+
+# Enum conversion maps built once at import; the converters previously
+# allocated a fresh dict literal on every call inside the marshalling loop
+_PROJECT_STATUS_FROM_PROTO = {
+    context_pb2.PROJECT_STATUS_ACTIVE: ProjectStatus.ACTIVE,
+    context_pb2.PROJECT_STATUS_COMPLETED: ProjectStatus.COMPLETED,
+    context_pb2.PROJECT_STATUS_ON_HOLD: ProjectStatus.ON_HOLD,
+    context_pb2.PROJECT_STATUS_ARCHIVED: ProjectStatus.ARCHIVED
+}
+_PROJECT_STATUS_TO_PROTO = {v: k for k, v in _PROJECT_STATUS_FROM_PROTO.items()}
+_RELATIONSHIP_TYPE_FROM_PROTO = {
+    context_pb2.RELATIONSHIP_TYPE_TEAM_MEMBER: RelationshipType.TEAM_MEMBER,
+    context_pb2.RELATIONSHIP_TYPE_STAKEHOLDER: RelationshipType.STAKEHOLDER,
+    context_pb2.RELATIONSHIP_TYPE_CLIENT: RelationshipType.CLIENT,
+    context_pb2.RELATIONSHIP_TYPE_VENDOR: RelationshipType.VENDOR
+}
+_RELATIONSHIP_TYPE_TO_PROTO = {v: k for k, v in _RELATIONSHIP_TYPE_FROM_PROTO.items()}
+
+def _rfc3339(dt: datetime) -> str:
+    """Render a datetime in the RFC 3339 form ParseDict expects for Timestamps."""
+    return dt.isoformat() + 'Z' if dt.tzinfo is None else dt.isoformat()
 
-@pydantic_dataclass
-class ProjectContext:
+class ProjectContext(msgspec.Struct, gc=False):
     """Project context information with comprehensive validation."""
     project_id: str
     project_name: str
     status: ProjectStatus
-    relevance_score: float = Field(ge=MIN_CONFIDENCE_SCORE, le=MAX_CONFIDENCE_SCORE)
+    relevance_score: ConfidenceScore
     key_terms: List[str]
-    attributes: Dict[str, str] = field(default_factory=dict)
+    attributes: Dict[str, str] = msgspec.field(default_factory=dict)
     last_updated: Optional[datetime] = None
 
     def validate(self) -> bool:
         """Validate project context according to business rules."""
-        if not self.project_id or not uuid.UUID(self.project_id, version=4):
+        return self._validate(datetime.utcnow().timestamp())
+
+    def _validate(self, now_ts: float) -> bool:
+        """Validate against a caller-supplied reference timestamp."""
+        if not _UUID4_RE.match(self.project_id):
             raise ValueError("Invalid project_id format")
-        
+
         if not self.project_name or len(self.project_name.strip()) == 0:
             raise ValueError("Project name cannot be empty")
-            
+
         if not self.key_terms or len(self.key_terms) == 0:
             raise ValueError("At least one key term is required")
-            
-        if self.last_updated and self.last_updated > datetime.utcnow():
+
+        if self.last_updated and self.last_updated.timestamp() > now_ts:
             raise ValueError("Last updated timestamp cannot be in the future")
-            
+
         return True
 
+    def _to_plain_dict(self) -> Dict[str, Any]:
+        """Proto-shaped dict used for single-call ParseDict construction."""
+        plain: Dict[str, Any] = {
+            'project_id': self.project_id,
+            'project_name': self.project_name,
+            'status': self.status.to_proto(),
+            'relevance_score': self.relevance_score,
+            'key_terms': self.key_terms,
+            'attributes': self.attributes
+        }
+        if self.last_updated:
+            plain['deadline'] = _rfc3339(self.last_updated)
+        return plain
+
     def to_proto(self) -> context_pb2.ProjectContext:
         """Convert to protocol buffer message."""
-        proto = context_pb2.ProjectContext()
-        proto.project_id = self.project_id
-        proto.project_name = self.project_name
-        proto.status = self.status.to_proto()
-        proto.relevance_score = self.relevance_score
-        proto.key_terms.extend(self.key_terms)
-        proto.attributes.update(self.attributes)
-        
-        if self.last_updated:
-            timestamp = Timestamp()
-            timestamp.FromDatetime(self.last_updated)
-            proto.deadline.CopyFrom(timestamp)
-            
-        return proto
+        return ParseDict(self._to_plain_dict(), context_pb2.ProjectContext())
 
     @classmethod
     def from_proto(cls, proto: context_pb2.ProjectContext) -> 'ProjectContext':
@@ -144,27 +169,27 @@ class ProjectContext:
             last_updated=last_updated
         )
 
-@pydantic_dataclass
-class RelationshipContext:
+class RelationshipContext(msgspec.Struct, gc=False):
     """Relationship mapping context with validation."""
     person_id: str
     email_address: str
     name: str
     type: RelationshipType
-    interaction_frequency: float = Field(ge=0.0, le=1.0)
+    interaction_frequency: FrequencyScore
     last_interaction: datetime
     sentiment_metrics: Dict[str, float]
     additional_attributes: Optional[Dict[str, str]] = None
 
     def validate(self) -> bool:
         """Validate relationship context data."""
+        return self._validate(datetime.utcnow().timestamp())
+
+    def _validate(self, now_ts: float) -> bool:
+        """Validate against a caller-supplied reference timestamp."""
         if not EMAIL_REGEX.match(self.email_address):
             raise ValueError("Invalid email address format")
-            
-        if self.interaction_frequency < 0.0 or self.interaction_frequency > 1.0:
-            raise ValueError("Interaction frequency must be between 0 and 1")
-            
-        if self.last_interaction > datetime.utcnow():
+
+        if self.last_interaction.timestamp() > now_ts:
             raise ValueError("Last interaction cannot be in the future")
             
         for metric, value in self.sentiment_metrics.items():
@@ -173,24 +198,24 @@ class RelationshipContext:
                 
         return True
 
+    def _to_plain_dict(self) -> Dict[str, Any]:
+        """Proto-shaped dict used for single-call ParseDict construction."""
+        plain: Dict[str, Any] = {
+            'person_id': self.person_id,
+            'email_address': self.email_address,
+            'name': self.name,
+            'type': self.type.to_proto(),
+            'interaction_frequency': self.interaction_frequency,
+            'last_interaction': _rfc3339(self.last_interaction),
+            'sentiment_metrics': self.sentiment_metrics
+        }
+        if self.additional_attributes:
+            plain['communication_preferences'] = self.additional_attributes
+        return plain
+
     def to_proto(self) -> context_pb2.RelationshipContext:
         """Convert to protocol buffer message."""
-        proto = context_pb2.RelationshipContext()
-        proto.person_id = self.person_id
-        proto.email_address = self.email_address
-        proto.name = self.name
-        proto.type = self.type.to_proto()
-        proto.interaction_frequency = self.interaction_frequency
-        
-        timestamp = Timestamp()
-        timestamp.FromDatetime(self.last_interaction)
-        proto.last_interaction.CopyFrom(timestamp)
-        
-        proto.sentiment_metrics.update(self.sentiment_metrics)
-        if self.additional_attributes:
-            proto.communication_preferences.update(self.additional_attributes)
-            
-        return proto
+        return ParseDict(self._to_plain_dict(), context_pb2.RelationshipContext())
 
     @classmethod
     def from_proto(cls, proto: context_pb2.RelationshipContext) -> 'RelationshipContext':
@@ -206,8 +231,7 @@ class RelationshipContext:
             additional_attributes=dict(proto.communication_preferences)
         )
 
-@pydantic_dataclass
-class Context:
+class Context(msgspec.Struct, gc=False):
     """Main context class with comprehensive validation."""
     context_id: str
     email_id: str
@@ -215,18 +239,24 @@ class Context:
     project_contexts: List[ProjectContext]
     relationship_contexts: List[RelationshipContext]
     topics: List[str]
-    confidence_score: float = Field(ge=MIN_CONFIDENCE_SCORE, le=MAX_CONFIDENCE_SCORE)
+    confidence_score: ConfidenceScore
     analyzed_at: datetime
     metadata: Dict[str, str]
     extended_attributes: Optional[Dict[str, Any]] = None
 
     def validate(self) -> bool:
         """Validate context object according to business rules."""
+        # Capture the clock once; nested validators reuse it instead of one
+        # utcnow() call per project/relationship context
+        return self._validate(datetime.utcnow().timestamp())
+
+    def _validate(self, now_ts: float) -> bool:
+        """Validate against a caller-supplied reference timestamp."""
         # Validate IDs
-        if not uuid.UUID(self.context_id, version=4):
+        if not _UUID4_RE.match(self.context_id):
             raise ValueError("Invalid context_id format")
-            
-        if not uuid.UUID(self.email_id, version=4):
+
+        if not _UUID4_RE.match(self.email_id):
             raise ValueError("Invalid email_id format")
             
         # Validate topics
@@ -234,62 +264,91 @@ class Context:
             raise ValueError(f"Maximum of {MAX_TOPICS} topics allowed")
             
         # Validate metadata
-        for field in REQUIRED_METADATA_FIELDS:
-            if field not in self.metadata:
-                raise ValueError(f"Required metadata field {field} missing")
-                
-        # Validate nested contexts
-        for project_context in self.project_contexts:
-            project_context.validate()
-            
-        for relationship_context in self.relationship_contexts:
-            relationship_context.validate()
-            
+        missing = _REQUIRED_METADATA_SET.difference(self.metadata)
+        if missing:
+            raise ValueError(f"Required metadata fields {sorted(missing)} missing")
+
+
+        # Validate nested contexts; all(map(...)) drives the iteration in C
+        # with no per-item Python frame, and validators raise on failure
+        _validate = operator.methodcaller('_validate', now_ts)
+        all(map(_validate, self.project_contexts))
+        all(map(_validate, self.relationship_contexts))
+
         # Validate timestamp
-        if self.analyzed_at > datetime.utcnow():
+        if self.analyzed_at.timestamp() > now_ts:
             raise ValueError("Analysis timestamp cannot be in the future")
             
         return True
 
+    def _validate_merge_invariants(self) -> bool:
+        """
+        Re-check only the invariants a merge can break.
+
+        Merging two already-valid contexts cannot invalidate IDs, emails or
+        nested objects; only the combined topic list, metadata union and the
+        adopted timestamp need another look.
+        """
+        if len(self.topics) > MAX_TOPICS:
+            raise ValueError(f"Maximum of {MAX_TOPICS} topics allowed")
+
+        missing = _REQUIRED_METADATA_SET.difference(self.metadata)
+        if missing:
+            raise ValueError(f"Required metadata fields {sorted(missing)} missing")
+
+        if self.analyzed_at.timestamp() > datetime.utcnow().timestamp():
+            raise ValueError("Analysis timestamp cannot be in the future")
+
+        return True
+
+    def _to_plain_dict(self) -> Dict[str, Any]:
+        """Proto-shaped dict covering the full nested context tree."""
+        metadata = dict(self.metadata)
+        if self.extended_attributes:
+            # One orjson encode under a single key beats per-value str()
+            # coercion and round-trips int/float/bool types losslessly
+            metadata[_EXT_PAYLOAD_KEY] = orjson.dumps(
+                self.extended_attributes
+            ).decode("ascii")
+        return {
+            'context_id': self.context_id,
+            'email_id': self.email_id,
+            'thread_id': self.thread_id,
+            'project_contexts': [pc._to_plain_dict()
+                                 for pc in self.project_contexts],
+            'relationship_contexts': [rc._to_plain_dict()
+                                      for rc in self.relationship_contexts],
+            'topics': self.topics,
+            'confidence_score': self.confidence_score,
+            'analyzed_at': _rfc3339(self.analyzed_at),
+            'metadata': metadata
+        }
+
     def to_proto(self) -> context_pb2.Context:
         """Convert to protocol buffer message."""
-        proto = context_pb2.Context()
-        proto.context_id = self.context_id
-        proto.email_id = self.email_id
-        proto.thread_id = self.thread_id
-        
-        # Convert nested contexts
-        proto.project_contexts.extend([pc.to_proto() for pc in self.project_contexts])
-        proto.relationship_contexts.extend([rc.to_proto() for rc in self.relationship_contexts])
-        
-        proto.topics.extend(self.topics)
-        proto.confidence_score = self.confidence_score
-        
-        timestamp = Timestamp()
-        timestamp.FromDatetime(self.analyzed_at)
-        proto.analyzed_at.CopyFrom(timestamp)
-        
-        proto.metadata.update(self.metadata)
-        
-        if self.extended_attributes:
-            for key, value in self.extended_attributes.items():
-                if isinstance(value, (str, int, float, bool)):
-                    proto.metadata[f"ext_{key}"] = str(value)
-                    
-        return proto
+        # ParseDict pushes the whole nested tree through the proto runtime in
+        # one call instead of one Python attribute-setter crossing per field
+        return ParseDict(self._to_plain_dict(), context_pb2.Context())
 
     @classmethod
     def from_proto(cls, proto: context_pb2.Context) -> 'Context':
         """Create instance from protocol buffer message."""
-        # Extract extended attributes
-        extended_attributes = {}
+        # Extended attributes travel as one JSON blob; fall back to the
+        # legacy per-key ext_ encoding for protos written before the change
         metadata = dict(proto.metadata)
-        ext_keys = [k for k in metadata.keys() if k.startswith("ext_")]
-        
-        for key in ext_keys:
-            extended_attributes[key[4:]] = metadata[key]
-            del metadata[key]
-            
+        payload = metadata.pop(_EXT_PAYLOAD_KEY, None)
+        if payload is not None:
+            extended_attributes = orjson.loads(payload)
+        else:
+            extended_attributes = {}
+            metadata = {}
+            for key, value in proto.metadata.items():
+                if key.startswith("ext_"):
+                    extended_attributes[key[4:]] = value
+                else:
+                    metadata[key] = value
+
+
         return cls(
             context_id=proto.context_id,
             email_id=proto.email_id,
@@ -301,4 +360,9 @@ class Context:
             analyzed_at=proto.analyzed_at.ToDatetime(),
             metadata=metadata,
             extended_attributes=extended_attributes
-        )
\ No newline at end of file
+        )
+
+# Decoders are compiled once at import; reuse them instead of calling
+# msgspec.json.decode with a type argument on every message
+CONTEXT_DECODER = msgspec.json.Decoder(Context)
+CONTEXT_LIST_DECODER = msgspec.json.Decoder(List[Context])
\ No newline at end of file
@@ -8,9 +8,13 @@ validation, and performance optimizations.
 
 import asyncio
 import logging
+import sys
 from typing import Dict, List, Tuple, Any, Optional
 from dataclasses import dataclass
 
+import msgspec  # version: 0.18+
+from cachetools import TTLCache  # version: 5.3+
+
 # Internal imports
 from ..models.context import Context, ProjectContext, RelationshipContext
 from ..utils.text_processor import TextAnalyzer
@@ -20,6 +24,9 @@ from .nlp_processor import NLPProcessor
 BATCH_SIZE = 32  # Optimal batch size for processing
 MIN_CONFIDENCE_THRESHOLD = 0.75  # Minimum confidence threshold for analysis
 MAX_RETRIES = 3  # Maximum retry attempts for processing
+REGISTRY_MAX_SIZE = 10_000  # Context fast-path cache entry cap
+REGISTRY_TTL = 3600  # Seconds a context stays in the fast-path cache
+_UPDATE_COUNT = sys.intern('update_count')  # Interned hot metadata key
 
 class ContextAnalyzer:
     """
@@ -48,7 +55,71 @@ class ContextAnalyzer:
             self._logger.error(f"Failed to initialize ContextAnalyzer: {e}")
             raise
 
-    @asyncio.coroutine
+        # Bounds concurrent NLP calls during batch analysis; a freed slot is
+        # handed to the next email immediately instead of waiting for a
+        # whole batch slice to finish
+        self._batch_semaphore = asyncio.Semaphore(BATCH_SIZE)
+
+        # In-memory fast path for recently analyzed contexts plus optional
+        # async storage clients attached from the application lifespan
+        # (motor / aioredis). TTLCache bounds size and expires stale
+        # entries, matching the embedding cache in the NLP processor
+        self._context_registry: TTLCache = TTLCache(
+            maxsize=REGISTRY_MAX_SIZE, ttl=REGISTRY_TTL
+        )
+        self._mongodb_collection = None
+        self._redis_client = None
+
+    def attach_storage(self, mongodb_collection: Any = None,
+                       redis_client: Any = None) -> None:
+        """
+        Attach the shared async storage clients created during application startup.
+
+        Args:
+            mongodb_collection: Motor (async) collection holding persisted contexts
+            redis_client: aioredis client used for context caching
+        """
+        self._mongodb_collection = mongodb_collection
+        self._redis_client = redis_client
+
+    async def get_context(self, context_id: str) -> Optional[Context]:
+        """
+        Retrieves a context by ID using only non-blocking lookups.
+
+        The in-memory registry is checked first, then the attached Motor
+        collection. Both paths stay on the event loop so concurrent requests
+        never queue behind a blocking driver call.
+
+        Args:
+            context_id: Unique context identifier
+
+        Returns:
+            Optional[Context]: The context if found, otherwise None
+        """
+        if not context_id:
+            raise ValueError("Context ID cannot be empty")
+
+        # Fast path: recently analyzed contexts
+        context = self._context_registry.get(context_id)
+        if context is not None:
+            return context
+
+        # Persistent storage via native async driver
+        if self._mongodb_collection is not None:
+            document = await self._mongodb_collection.find_one(
+                {'context_id': context_id}
+            )
+            if document is not None:
+                document.pop('_id', None)
+                # convert() rebuilds the nested Struct tree and parses the
+                # RFC 3339 timestamps; Context(**document) would leave the
+                # sub-documents as plain dicts
+                context = msgspec.convert(document, Context)
+                self._context_registry[context_id] = context
+                return context
+
+        return None
+
     async def analyze_email(self, email_id: str, content: str, thread_id: str) -> Context:
         """
         Analyzes a single email with enhanced validation and error handling.
@@ -97,6 +168,7 @@ class ContextAnalyzer:
                         f"Successfully analyzed email {email_id} with confidence "
                         f"score {context.confidence_score}"
                     )
+                    self._context_registry[context.context_id] = context
                     return context
 
             except Exception as e:
@@ -108,13 +180,31 @@ class ContextAnalyzer:
 
         raise RuntimeError("Failed to achieve minimum confidence threshold in analysis")
 
-    @asyncio.coroutine
-    async def analyze_batch(self, email_batch: List[Tuple[str, str, str]]) -> List[Context]:
+    async def _bounded_analyze(self, email_id: str, content: str, thread_id: str,
+                               min_confidence: Optional[float]) -> Optional[Context]:
+        """
+        Analyze one email under the batch semaphore, absorbing per-email
+        failures so a single bad email never aborts the whole batch.
+        """
+        async with self._batch_semaphore:
+            try:
+                context = await self.analyze_email(email_id, content, thread_id)
+            except Exception as e:
+                self._logger.error(f"Failed to process email {email_id}: {e}")
+                return None
+        if min_confidence is not None and context.confidence_score < min_confidence:
+            return None
+        return context
+
+    async def analyze_batch(self, email_batch: List[Tuple[str, str, str]],
+                            min_confidence: Optional[float] = None) -> List[Context]:
         """
         Processes email batches concurrently with optimized performance.
 
         Args:
             email_batch: List of tuples containing (email_id, content, thread_id)
+            min_confidence: Optional confidence floor; results below it are
+                discarded during result assembly instead of in a second pass
 
         Returns:
             List[Context]: List of validated context objects
@@ -128,36 +218,26 @@ class ContextAnalyzer:
             raise ValueError("Email batch cannot be empty")
 
         self._logger.info(f"Starting batch analysis for {len(email_batch)} emails")
-        
-        # Split into optimal batch sizes
-        results = []
-        for i in range(0, len(email_batch), BATCH_SIZE):
-            batch_slice = email_batch[i:i + BATCH_SIZE]
-            
-            try:
-                # Process batch concurrently
-                batch_tasks = [
-                    self.analyze_email(email_id, content, thread_id)
-                    for email_id, content, thread_id in batch_slice
+
+        # Schedule every email at once behind the semaphore: at most
+        # BATCH_SIZE analyses run concurrently, but a freed slot starts the
+        # next email immediately instead of waiting on a slice barrier
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self._bounded_analyze(
+                        email_id, content, thread_id, min_confidence
+                    ))
+                    for email_id, content, thread_id in email_batch
                 ]
-                
-                batch_results = await asyncio.gather(
-                    *batch_tasks,
-                    return_exceptions=True
-                )
-
-                # Handle partial batch failures
-                for j, result in enumerate(batch_results):
-                    if isinstance(result, Exception):
-                        self._logger.error(
-                            f"Failed to process email {batch_slice[j][0]}: {result}"
-                        )
-                    else:
-                        results.append(result)
+        except* Exception as eg:
+            self._logger.error(f"Batch processing error: {eg.exceptions}")
+            raise RuntimeError("Failed to process email batch") from eg
 
-            except Exception as e:
-                self._logger.error(f"Batch processing error: {e}")
-                raise RuntimeError("Failed to process email batch") from e
+        # Per-email failures return None inside _bounded_analyze; one filtered
+        # pass assembles the results without re-reading each task
+        results = [context for context in (task.result() for task in tasks)
+                   if context is not None]
 
         self._logger.info(
             f"Completed batch analysis. Successful: {len(results)}, "
@@ -165,6 +245,56 @@ class ContextAnalyzer:
         )
         return results
 
+    async def analyze_batch_columnar(self, email_ids: Tuple[str, ...],
+                                     contents: Tuple[str, ...],
+                                     thread_ids: Tuple[str, ...],
+                                     min_confidence: Optional[float] = None) -> List[Context]:
+        """
+        Columnar (struct-of-arrays) batch analysis.
+
+        The content column is handed to the NLP processor as one list so the
+        tokenizer and model see a single padded batch instead of per-email
+        calls, while ids stay in parallel arrays for cheap result assembly.
+
+        Args:
+            email_ids: Column of email identifiers
+            contents: Column of raw email bodies
+            thread_ids: Column of thread identifiers
+            min_confidence: Optional confidence floor applied during assembly
+
+        Returns:
+            List[Context]: Validated context objects in input order
+        """
+        if not email_ids:
+            raise ValueError("Email batch cannot be empty")
+
+        self._logger.info(f"Starting columnar batch analysis for {len(email_ids)} emails")
+
+        # One vectorized NLP pass over the whole content column
+        processed_batch = await self._nlp_processor.batch_process_emails(list(contents))
+
+        results = []
+        for email_id, thread_id, processed_content in zip(email_ids, thread_ids,
+                                                          processed_batch):
+            try:
+                context = self._nlp_processor.extract_semantic_context(processed_content)
+                context.email_id = email_id
+                context.thread_id = thread_id
+
+                if context.validate() and (
+                        min_confidence is None or
+                        context.confidence_score >= min_confidence):
+                    self._context_registry[context.context_id] = context
+                    results.append(context)
+            except Exception as e:
+                self._logger.error(f"Failed to process email {email_id}: {e}")
+
+        self._logger.info(
+            f"Completed columnar batch analysis. Successful: {len(results)}, "
+            f"Failed: {len(email_ids) - len(results)}"
+        )
+        return results
+
     def update_context(self, existing_context: Context, new_context: Context) -> Context:
         """
         Updates existing context with enhanced merge validation.
@@ -180,54 +310,64 @@ class ContextAnalyzer:
             ValueError: If input contexts are invalid
             RuntimeError: If merge operation fails
         """
-        # Validate input contexts
-        if not existing_context.validate() or not new_context.validate():
-            raise ValueError("Invalid context objects provided for update")
-
+        # Inputs were validated when they were analyzed or loaded; a full
+        # re-validation here would re-walk every nested context per merge
         try:
-            # Merge project contexts
-            merged_projects = {pc.project_id: pc for pc in existing_context.project_contexts}
-            for new_project in new_context.project_contexts:
-                if new_project.project_id in merged_projects:
-                    # Update existing project context
-                    existing_project = merged_projects[new_project.project_id]
-                    existing_project.relevance_score = max(
-                        existing_project.relevance_score,
-                        new_project.relevance_score
-                    )
-                    existing_project.key_terms = list(set(
-                        existing_project.key_terms + new_project.key_terms
-                    ))
-                else:
-                    merged_projects[new_project.project_id] = new_project
-
-            # Merge relationship contexts
-            merged_relationships = {
-                rc.person_id: rc for rc in existing_context.relationship_contexts
-            }
-            for new_relation in new_context.relationship_contexts:
-                if new_relation.person_id in merged_relationships:
-                    # Update existing relationship
-                    existing_relation = merged_relationships[new_relation.person_id]
-                    existing_relation.interaction_frequency = (
-                        existing_relation.interaction_frequency + 
-                        new_relation.interaction_frequency
-                    ) / 2
-                    existing_relation.last_interaction = max(
-                        existing_relation.last_interaction,
-                        new_relation.last_interaction
-                    )
-                else:
-                    merged_relationships[new_relation.person_id] = new_relation
+            # Merge project contexts; a single .get replaces the membership
+            # test + subscript pair (two hash probes per project). Skip the
+            # index build entirely when the new context brings nothing to join
+            if not new_context.project_contexts:
+                merged_project_list = existing_context.project_contexts
+            else:
+                merged_projects = {
+                    pc.project_id: pc for pc in existing_context.project_contexts
+                }
+                for new_project in new_context.project_contexts:
+                    existing_project = merged_projects.get(new_project.project_id)
+                    if existing_project is not None:
+                        # Update existing project context; inline conditionals
+                        # skip the builtin dispatch max() goes through
+                        new_score = new_project.relevance_score
+                        if new_score > existing_project.relevance_score:
+                            existing_project.relevance_score = new_score
+                        # Set unpacking dedupes in one C-level update without
+                        # the throwaway concatenated list
+                        existing_project.key_terms = [*{
+                            *existing_project.key_terms, *new_project.key_terms
+                        }]
+                    else:
+                        merged_projects[new_project.project_id] = new_project
+                merged_project_list = list(merged_projects.values())
+
+            # Merge relationship contexts, with the same no-join fast path
+            if not new_context.relationship_contexts:
+                merged_relationship_list = existing_context.relationship_contexts
+            else:
+                merged_relationships = {
+                    rc.person_id: rc for rc in existing_context.relationship_contexts
+                }
+                for new_relation in new_context.relationship_contexts:
+                    existing_relation = merged_relationships.get(new_relation.person_id)
+                    if existing_relation is not None:
+                        # Update existing relationship
+                        existing_relation.interaction_frequency = (
+                            existing_relation.interaction_frequency +
+                            new_relation.interaction_frequency
+                        ) / 2
+                        if new_relation.last_interaction > existing_relation.last_interaction:
+                            existing_relation.last_interaction = new_relation.last_interaction
+                    else:
+                        merged_relationships[new_relation.person_id] = new_relation
+                merged_relationship_list = list(merged_relationships.values())
 
             # Create updated context
             updated_context = Context(
                 context_id=existing_context.context_id,
                 email_id=existing_context.email_id,
                 thread_id=existing_context.thread_id,
-                project_contexts=list(merged_projects.values()),
-                relationship_contexts=list(merged_relationships.values()),
-                topics=list(set(existing_context.topics + new_context.topics)),
+                project_contexts=merged_project_list,
+                relationship_contexts=merged_relationship_list,
+                topics=[*{*existing_context.topics, *new_context.topics}],
                 confidence_score=max(
                     existing_context.confidence_score,
                     new_context.confidence_score
@@ -236,14 +376,14 @@ class ContextAnalyzer:
                 metadata={
                     **existing_context.metadata,
                     **new_context.metadata,
-                    'update_count': str(
-                        int(existing_context.metadata.get('update_count', '0')) + 1
+                    _UPDATE_COUNT: str(
+                        int(existing_context.metadata.get(_UPDATE_COUNT, '0')) + 1
                     )
                 }
             )
 
-            # Validate merged context
-            if not updated_context.validate():
+            # Only the invariants a merge can break need re-checking
+            if not updated_context._validate_merge_invariants():
                 raise ValueError("Merged context validation failed")
 
             self._logger.info(
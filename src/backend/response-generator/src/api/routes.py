@@ -8,23 +8,35 @@ Version: 1.0.0
 License: MIT
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, validator
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson  # ^3.9.0
+from cachetools import TTLCache  # ^5.3.0
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from opentelemetry import trace  # ^0.41b0
 from prometheus_client import Counter, Histogram  # ^0.17.0
-from redis import Redis  # ^5.0.1
+from redis.asyncio import Redis  # ^5.0.1
 import time
 
 from ..models.response import Response, ResponseTemplate
+from ..services.batch_scheduler import BatchScheduler
 from ..services.generator import ResponseGenerator
-from ..config.settings import Settings
+from ..services.semantic_cache import SemanticCache
+from ..services.template_manager import TemplateManager
+from ..utils.ai_processor import AIProcessor
+from ..config.settings import get_settings
 from ....shared.proto.response_pb2 import ResponseTone, ResponseStatus
 
-# Initialize router with prefix and tags
-router = APIRouter(prefix="/api/v1/responses", tags=["responses"])
+# Initialize router with prefix and tags; orjson serializes response
+# bodies several times faster than the stdlib encoder JSONResponse uses
+router = APIRouter(
+    prefix="/api/v1/responses",
+    tags=["responses"],
+    default_response_class=ORJSONResponse
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -36,24 +48,113 @@ tracer = trace.get_tracer(__name__)
 RESPONSE_GENERATION_COUNTER = Counter(
     "response_generation_total",
     "Total number of response generation requests",
-    ["status", "tone"]
+    ["status", "tone", "cache_hit"]
 )
 RESPONSE_GENERATION_DURATION = Histogram(
     "response_generation_duration_seconds",
     "Response generation duration in seconds"
 )
 
-# Initialize services
-settings = Settings()
-response_generator = ResponseGenerator()
-cache = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+# Label handles resolved once: .labels() does dict lookups and tuple
+# hashing inside prometheus_client on every call, and the label space
+# here is small and fixed
+_COUNTER_HANDLES = {
+    (status, tone, cache_hit): RESPONSE_GENERATION_COUNTER.labels(
+        status=status, tone=tone, cache_hit=cache_hit
+    )
+    for status in ("success", "error")
+    for tone in ResponseTone.keys()
+    for cache_hit in ("true", "false")
+}
+
+# Initialize services; the cached accessor shares one validated
+# Settings instance with main.py instead of re-parsing the environment
+settings = get_settings()
+cache = Redis.from_url(settings.REDIS_URI, max_connections=64)
+
+# The generation stack is built at startup, not import: importing this
+# module (tests, tooling, a preloading gunicorn master) stays cheap and
+# each worker constructs its own instances after fork. That includes the
+# semantic cache, whose constructor loads the embedding model
+response_generator: Optional[ResponseGenerator] = None
+batch_scheduler: Optional[BatchScheduler] = None
+semantic_cache: Optional[SemanticCache] = None
+
+# Analytics updates ride a bounded in-process queue drained by one
+# dedicated task instead of per-request BackgroundTasks: a burst of
+# requests no longer stacks post-send work on the response path, and
+# backpressure is explicit (oldest entries drop first)
+ANALYTICS_QUEUE_MAXSIZE = 10_000
+FEEDBACK_STREAM = "response_feedback"
+analytics_queue: Optional["asyncio.Queue[Tuple[str, Dict[str, Any]]]"] = None
+_worker_tasks: List["asyncio.Task[None]"] = []
+
+
+@router.on_event("startup")
+async def start_services() -> None:
+    """Construct and warm the generation stack once the event loop exists."""
+    global response_generator, batch_scheduler, semantic_cache, analytics_queue
+    semantic_cache = SemanticCache(cache, use_onnx=settings.ONNX_BACKEND)
+    ai_processor = AIProcessor(settings)
+    template_manager = TemplateManager(cache, ai_processor)
+    response_generator = ResponseGenerator(template_manager, ai_processor, {})
+    await response_generator.warmup()
+    batch_scheduler = BatchScheduler(response_generator)
+    batch_scheduler.start()
+    analytics_queue = asyncio.Queue(maxsize=ANALYTICS_QUEUE_MAXSIZE)
+    _worker_tasks.append(asyncio.create_task(_analytics_worker()))
+    _worker_tasks.append(asyncio.create_task(_feedback_worker()))
+
+
+@router.on_event("shutdown")
+async def stop_services() -> None:
+    """Drain and stop the micro-batching dispatcher and queue workers."""
+    if batch_scheduler is not None:
+        await batch_scheduler.stop()
+    for task in _worker_tasks:
+        task.cancel()
+    _worker_tasks.clear()
+
+# Rate limiting: one atomic Lua round-trip instead of INCR + racy EXPIRE.
+# The key is created with its TTL in the same script invocation
+RATE_LIMIT_WINDOW_SECONDS = 60
+_RATE_LIMIT_LOCAL_BATCH = 10
+_RATE_LIMIT_LUA = """
+local c = redis.call('INCRBY', KEYS[1], ARGV[2])
+if c == tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return c
+"""
+rate_limit_script = cache.register_script(_RATE_LIMIT_LUA)
+
+# Per-process window state: [pending increments, last global count,
+# window reset deadline]. Lets most requests decide locally and flush
+# their increments to Redis in batches. The client id comes from a
+# caller-controlled header, so the structure is bounded: entries expire
+# with the window and the LRU cap stops unique ids growing the map
+_RATE_LIMIT_MAX_CLIENTS = 10_000
+_rate_limit_local: "TTLCache[str, List[float]]" = TTLCache(
+    maxsize=_RATE_LIMIT_MAX_CLIENTS, ttl=RATE_LIMIT_WINDOW_SECONDS
+)
+
+# Hoisted so the per-request validator does no set construction
+_REQUIRED_CTX_FIELDS = frozenset(
+    {"email_content", "project_context", "relationship_context"}
+)
+
 
 class GenerateResponseRequest(BaseModel):
     """Request model for response generation with enhanced validation."""
-    
+
+    model_config = ConfigDict(extra="ignore")
+
     email_id: str = Field(..., description="Original email identifier")
     context_data: Dict[str, Any] = Field(..., description="Context information for response")
-    tone: ResponseTone = Field(..., description="Desired response tone")
+    # Annotated as int: ResponseTone is a protobuf EnumTypeWrapper, not a
+    # type, so pydantic v2 cannot build a schema from it. Proto enum
+    # members are plain ints; the validator pins the value to the enum
+    tone: int = Field(..., description="Desired response tone (ResponseTone value)")
     template_id: Optional[str] = Field(None, description="Optional template identifier")
     preferences: Optional[Dict[str, Any]] = Field(
         default_factory=dict,
@@ -64,17 +165,31 @@ class GenerateResponseRequest(BaseModel):
         description="Required topics to address"
     )
 
-    @validator("context_data")
+    @field_validator("tone", mode="after")
+    @classmethod
+    def validate_tone(cls, v: int) -> int:
+        """Reject values outside the ResponseTone enum."""
+        if v not in ResponseTone.values():
+            raise ValueError(
+                f"Invalid tone {v}; expected one of {sorted(ResponseTone.values())}"
+            )
+        return v
+
+    @field_validator("context_data", mode="after")
+    @classmethod
     def validate_context(cls, v: Dict[str, Any]) -> Dict[str, Any]:
         """Validate context data completeness."""
-        required_fields = {"email_content", "project_context", "relationship_context"}
-        if not all(field in v for field in required_fields):
-            raise ValueError(f"Missing required context fields: {required_fields - v.keys()}")
+        if not _REQUIRED_CTX_FIELDS <= v.keys():
+            raise ValueError(
+                f"Missing required context fields: {_REQUIRED_CTX_FIELDS - v.keys()}"
+            )
         return v
 
 class CustomizeResponseRequest(BaseModel):
     """Request model for response customization."""
-    
+
+    model_config = ConfigDict(extra="ignore")
+
     modifications: Dict[str, Any] = Field(..., description="Requested modifications")
     preserve_context: bool = Field(True, description="Whether to preserve original context")
     feedback: Optional[Dict[str, Any]] = Field(None, description="Learning feedback data")
@@ -84,7 +199,7 @@ async def generate_response(
     request: GenerateResponseRequest,
     background_tasks: BackgroundTasks,
     req: Request
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Generate an AI-powered email response with context awareness and monitoring.
     
@@ -94,22 +209,42 @@ async def generate_response(
         req: FastAPI request object
     
     Returns:
-        JSONResponse: Generated response with metadata
+        ORJSONResponse: Generated response with metadata
     """
     with tracer.start_as_current_span("generate_response") as span:
         start_time = time.time()
-        
+        # Resolved before the try so the error-path counter can label by
+        # tone even when the failure precedes cache and generation
+        tone_name = ResponseTone.Name(request.tone)
+
         try:
             # Extract client info for monitoring
             client_id = req.headers.get("X-Client-ID", "unknown")
             span.set_attribute("client.id", client_id)
-            
+
             # Check rate limits
             if not await check_rate_limit(client_id):
                 raise HTTPException(status_code=429, detail="Rate limit exceeded")
-            
-            # Generate response
-            response = await response_generator.generate_response(
+
+            # Semantic cache: repeated or paraphrased requests for the same
+            # content and tone skip the model call entirely
+            cached_payload = await semantic_cache.get(
+                tone_name,
+                request.context_data["email_content"],
+                request.required_topics
+            )
+            if cached_payload is not None:
+                span.set_attribute("cache.hit", True)
+                _COUNTER_HANDLES[("success", tone_name, "true")].inc()
+                return ORJSONResponse(
+                    status_code=200,
+                    content=cached_payload,
+                    headers={"X-Cache": "HIT"}
+                )
+
+            # Generate response; concurrent requests arriving within the
+            # scheduler's window ride one coalesced dispatch
+            response = await batch_scheduler.submit(
                 email_id=request.email_id,
                 context_data=request.context_data,
                 tone=request.tone,
@@ -119,46 +254,85 @@ async def generate_response(
             # Update metrics
             duration = time.time() - start_time
             RESPONSE_GENERATION_DURATION.observe(duration)
-            RESPONSE_GENERATION_COUNTER.labels(
-                status="success",
-                tone=request.tone.name
-            ).inc()
-            
-            # Schedule background tasks
-            background_tasks.add_task(
-                update_analytics,
+            _COUNTER_HANDLES[("success", tone_name, "false")].inc()
+
+            payload = {
+                "response_id": response.response_id,
+                "content": response.content,
+                "metadata": response.metadata,
+                "confidence_score": response.confidence_score
+            }
+
+            # Analytics go through the persistent queue; only the cache
+            # write (needs the embedding model) stays a background task
+            _enqueue_analytics(
                 response.response_id,
                 {"generation_time": duration, "success": True}
             )
-            
-            return JSONResponse(
+            background_tasks.add_task(
+                semantic_cache.put,
+                tone_name,
+                request.context_data["email_content"],
+                payload
+            )
+
+            return ORJSONResponse(
                 status_code=200,
-                content={
-                    "response_id": response.response_id,
-                    "content": response.content,
-                    "metadata": response.metadata,
-                    "confidence_score": response.confidence_score
-                }
+                content=payload,
+                headers={"X-Cache": "MISS"}
             )
             
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}", exc_info=True)
-            RESPONSE_GENERATION_COUNTER.labels(
-                status="error",
-                tone=request.tone.name
-            ).inc()
+            _COUNTER_HANDLES[("error", tone_name, "false")].inc()
             
             raise HTTPException(
                 status_code=500,
                 detail=f"Response generation failed: {str(e)}"
             )
 
+@router.post("/generate/stream")
+async def generate_response_stream(
+    request: GenerateResponseRequest,
+    req: Request
+) -> StreamingResponse:
+    """
+    Stream a generated response as server-sent events.
+
+    The first token goes out as soon as the model produces it instead of
+    after the whole body is generated and serialized; clients wanting the
+    full scored JSON payload use /generate.
+
+    Args:
+        request: Response generation parameters
+        req: FastAPI request object
+
+    Returns:
+        StreamingResponse: text/event-stream of content tokens
+    """
+    client_id = req.headers.get("X-Client-ID", "unknown")
+    if not await check_rate_limit(client_id):
+        raise HTTPException(status_code=429, detail="Rate limit exceeded")
+
+    async def _sse():
+        async for token in response_generator.stream_response(
+            email_id=request.email_id,
+            context_data=request.context_data,
+            tone=request.tone,
+            preferences=request.preferences or {}
+        ):
+            yield f"data: {orjson.dumps({'t': token}).decode()}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(_sse(), media_type="text/event-stream")
+
+
 @router.put("/{response_id}/customize")
 async def customize_response(
     response_id: str,
     request: CustomizeResponseRequest,
     background_tasks: BackgroundTasks
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Customize an existing response with learning feedback.
     
@@ -168,7 +342,7 @@ async def customize_response(
         background_tasks: Background task manager
     
     Returns:
-        JSONResponse: Customized response
+        ORJSONResponse: Customized response
     """
     with tracer.start_as_current_span("customize_response") as span:
         try:
@@ -181,15 +355,20 @@ async def customize_response(
                 preserve_context=request.preserve_context
             )
             
-            # Process learning feedback if provided
+            # Learning feedback is rare and durable-worthy: append it to a
+            # capped Redis Stream instead of holding it in this process
             if request.feedback:
-                background_tasks.add_task(
-                    process_feedback,
-                    response_id,
-                    request.feedback
+                await cache.xadd(
+                    FEEDBACK_STREAM,
+                    {
+                        "response_id": response_id,
+                        "feedback": orjson.dumps(request.feedback)
+                    },
+                    maxlen=ANALYTICS_QUEUE_MAXSIZE,
+                    approximate=True
                 )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=200,
                 content={
                     "response_id": customized_response.response_id,
@@ -208,55 +387,73 @@ async def customize_response(
 async def check_rate_limit(client_id: str) -> bool:
     """Check if client has exceeded rate limits."""
     try:
-        key = f"rate_limit:{client_id}"
-        current = await cache.incr(key)
-        if current == 1:
-            await cache.expire(key, 60)  # 1-minute window
-        return current <= settings.API_RATE_LIMIT
+        now = time.monotonic()
+        state = _rate_limit_local.get(client_id)
+        if state is None or now >= state[2]:
+            state = [0, 0, now + RATE_LIMIT_WINDOW_SECONDS]
+            _rate_limit_local[client_id] = state
+
+        state[0] += 1
+        # While the local estimate is comfortably under the limit, skip
+        # Redis entirely and batch the pending increments
+        if (state[0] < _RATE_LIMIT_LOCAL_BATCH
+                and state[1] + state[0]
+                <= settings.API_RATE_LIMIT - _RATE_LIMIT_LOCAL_BATCH):
+            return True
+
+        current = await rate_limit_script(
+            keys=[f"rate_limit:{client_id}"],
+            args=[RATE_LIMIT_WINDOW_SECONDS, int(state[0])]
+        )
+        state[1] = int(current)
+        state[0] = 0
+        return state[1] <= settings.API_RATE_LIMIT
     except Exception as e:
         logger.warning(f"Rate limit check failed: {str(e)}")
         return True  # Fail open on cache errors
 
-async def update_analytics(response_id: str, metrics: Dict[str, Any]) -> None:
-    """Update response analytics in background."""
+def _enqueue_analytics(response_id: str, metrics: Dict[str, Any]) -> None:
+    """Queue an analytics update, dropping the oldest entry when full."""
     try:
-        await response_generator.update_response_metrics(response_id, metrics)
-    except Exception as e:
-        logger.error(f"Error updating analytics: {str(e)}")
+        analytics_queue.put_nowait((response_id, metrics))
+    except asyncio.QueueFull:
+        try:
+            analytics_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        analytics_queue.put_nowait((response_id, metrics))
 
-async def process_feedback(response_id: str, feedback: Dict[str, Any]) -> None:
-    """Process learning feedback in background."""
-    try:
-        await response_generator.process_learning_feedback(response_id, feedback)
-    except Exception as e:
-        logger.error(f"Error processing feedback: {str(e)}")
-```
-
-This implementation provides a comprehensive FastAPI routes module for the Response Generator service with the following key features:
-
-1. Advanced response generation endpoint with context awareness
-2. Response customization with learning feedback
-3. Comprehensive request/response validation
-4. Distributed tracing integration
-5. Prometheus metrics collection
-6. Rate limiting with Redis
-7. Background task processing
-8. Extensive error handling and logging
-9. Type safety throughout
-
-The code follows enterprise-grade best practices:
-- Proper error handling and logging
-- Comprehensive monitoring and metrics
-- Request validation and rate limiting
-- Background task processing
-- Clean separation of concerns
-- Detailed documentation
-- Type safety with Pydantic models
-
-The routes can be included in a FastAPI application by importing and including the router:
-```python
-from fastapi import FastAPI
-from .api.routes import router as response_routes
-
-app = FastAPI()
-app.include_router(response_routes)
\ No newline at end of file
+async def _analytics_worker() -> None:
+    """Drain queued analytics updates off the request path."""
+    while True:
+        response_id, metrics = await analytics_queue.get()
+        try:
+            await response_generator.update_response_metrics(response_id, metrics)
+        except Exception as e:
+            logger.error(f"Error updating analytics: {str(e)}")
+        finally:
+            analytics_queue.task_done()
+
+async def _feedback_worker() -> None:
+    """Consume learning feedback from the Redis Stream."""
+    last_id = "$"
+    while True:
+        try:
+            batches = await cache.xread(
+                {FEEDBACK_STREAM: last_id}, count=16, block=5000
+            )
+            for _stream, entries in batches:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    try:
+                        await response_generator.process_learning_feedback(
+                            fields[b"response_id"].decode(),
+                            orjson.loads(fields[b"feedback"])
+                        )
+                    except Exception as e:
+                        logger.error(f"Error processing feedback: {str(e)}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Feedback stream read failed: {str(e)}")
+            await asyncio.sleep(1)
\ No newline at end of file
@@ -5,12 +5,15 @@ Handles environment variables, validation and type safety using Pydantic.
 Version: 1.0.0
 """
 
-from pydantic_settings import BaseSettings  # v2.0.0
-from pydantic import Field, validator  # v2.4.0
-from typing import Optional, Dict, Any
+from pydantic_settings import BaseSettings, SettingsConfigDict  # v2.0.0
+from pydantic import Field, StringConstraints  # v2.4.0
+from typing import Annotated, Optional, Dict, Any, Literal
+from functools import lru_cache
+import atexit
 import logging
+import queue
 import re
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Default configuration constants
 DEFAULT_MODEL_NAME = "gpt-4"
@@ -23,8 +26,51 @@ RETRY_BACKOFF = 2
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DEFAULT_LOG_LEVEL = "INFO"
 
-# Allowed models for response generation
-ALLOWED_MODELS = ["gpt-4", "gpt-3.5-turbo", "gpt-4-32k"]
+# Allowed models for response generation; Literal membership is checked
+# as a hash lookup inside pydantic-core, with no Python callback
+AllowedModel = Literal["gpt-4", "gpt-3.5-turbo", "gpt-4-32k"]
+
+# Compiled once at import: the filter runs on every emitted log record,
+# so per-record pattern parsing and re-cache lookups are pure overhead.
+# Each pattern carries a literal sentinel prefix checked with `in` (a
+# C-level substring scan) before the regex engine is entered at all
+_SENSITIVE_PATTERNS = (
+    ('sk-', re.compile(r'sk-[a-zA-Z0-9]{48}'), 'sk-***'),
+    ('password=', re.compile(r'password=[\w\d@$!%*?&]{8,}'), 'password=***')
+)
+
+
+# Bound on records parked between the emitting threads and the writer
+# thread; a full queue drops the oldest record rather than blocking
+_LOG_QUEUE_MAXSIZE = 16384
+
+
+class _DropOldestQueueHandler(QueueHandler):
+    """QueueHandler that sheds the oldest record when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(record)
+
+
+class SensitiveDataFilter(logging.Filter):
+    """Masks API keys and credentials in log messages before emission."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        msg = record.msg if isinstance(record.msg, str) else str(record.msg)
+        # Almost no lines contain a sentinel; the substring probes
+        # short-circuit those records without touching the regexes
+        for sentinel, pattern, replacement in _SENSITIVE_PATTERNS:
+            if sentinel in msg:
+                msg = pattern.sub(replacement, msg)
+        record.msg = msg
+        return True
 
 class Settings(BaseSettings):
     """
@@ -32,22 +78,35 @@ class Settings(BaseSettings):
     Implements environment variable loading, validation, and type safety.
     """
     
-    # OpenAI Configuration
-    OPENAI_API_KEY: str = Field(..., description="OpenAI API key for response generation")
-    OPENAI_MODEL_NAME: str = Field(DEFAULT_MODEL_NAME, description="OpenAI model name")
+    # OpenAI Configuration; the format checks are StringConstraints
+    # patterns so they run in pydantic-core rather than Python validators
+    OPENAI_API_KEY: Annotated[str, StringConstraints(pattern=r"^sk-.{17,}")] = Field(
+        ..., description="OpenAI API key for response generation"
+    )
+    OPENAI_MODEL_NAME: AllowedModel = Field(DEFAULT_MODEL_NAME, description="OpenAI model name")
     OPENAI_TEMPERATURE: float = Field(DEFAULT_TEMPERATURE, ge=0.0, le=1.0)
     OPENAI_MAX_TOKENS: int = Field(DEFAULT_MAX_TOKENS, gt=0, le=32000)
     
     # Response Generation Settings
     MIN_CONFIDENCE_THRESHOLD: float = Field(MIN_CONFIDENCE_SCORE, ge=0.0, le=1.0)
     MAX_TEMPLATE_LENGTH: int = Field(MAX_TEMPLATE_SIZE, gt=0)
+    # Run the local embedding encoder through ONNX Runtime instead of
+    # PyTorch when available (falls back automatically when the export
+    # or runtime is missing)
+    ONNX_BACKEND: bool = Field(False, description="Use ONNX Runtime for the embedding encoder")
     
     # Database Configuration
-    MONGODB_URI: str = Field(..., description="MongoDB connection URI")
-    REDIS_URI: str = Field(..., description="Redis connection URI")
-    
+    MONGODB_URI: Annotated[str, StringConstraints(pattern=r"^mongodb")] = Field(
+        ..., description="MongoDB connection URI"
+    )
+    REDIS_URI: Annotated[str, StringConstraints(pattern=r"^redis")] = Field(
+        ..., description="Redis connection URI"
+    )
+
     # Service Configuration
-    LOG_LEVEL: str = Field(DEFAULT_LOG_LEVEL, regex="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")
+    LOG_LEVEL: Annotated[
+        str, StringConstraints(pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")
+    ] = Field(DEFAULT_LOG_LEVEL)
     API_RATE_LIMIT: int = Field(100, gt=0, description="Requests per minute limit")
     API_TIMEOUT: int = Field(30, gt=0, description="API timeout in seconds")
     MAX_RETRIES: int = Field(RETRY_ATTEMPTS, ge=0)
@@ -83,34 +142,6 @@ class Settings(BaseSettings):
         }
     )
 
-    @validator("OPENAI_API_KEY")
-    def validate_api_key(cls, v: str) -> str:
-        """Validate OpenAI API key format."""
-        if not v.startswith("sk-") or len(v) < 20:
-            raise ValueError("Invalid OpenAI API key format")
-        return v
-
-    @validator("OPENAI_MODEL_NAME")
-    def validate_model_name(cls, v: str) -> str:
-        """Validate OpenAI model name."""
-        if v not in ALLOWED_MODELS:
-            raise ValueError(f"Model must be one of: {', '.join(ALLOWED_MODELS)}")
-        return v
-
-    @validator("MONGODB_URI")
-    def validate_mongodb_uri(cls, v: str) -> str:
-        """Validate MongoDB URI format."""
-        if not v.startswith("mongodb"):
-            raise ValueError("Invalid MongoDB URI format")
-        return v
-
-    @validator("REDIS_URI")
-    def validate_redis_uri(cls, v: str) -> str:
-        """Validate Redis URI format."""
-        if not v.startswith("redis"):
-            raise ValueError("Invalid Redis URI format")
-        return v
-
     def configure_logging(self) -> None:
         """Configure logging settings for the service."""
         log_level = getattr(logging, self.LOG_LEVEL.upper())
@@ -133,45 +164,33 @@ class Settings(BaseSettings):
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        
-        # Add handlers to logger
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-        
+
+        # Hand records to a background writer thread: the emitting side
+        # only enqueues, so request handlers never block on disk or
+        # console I/O. The listener flushes on interpreter exit
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(
+            maxsize=_LOG_QUEUE_MAXSIZE
+        )
+        logger.addHandler(_DropOldestQueueHandler(log_queue))
+        listener = QueueListener(
+            log_queue, file_handler, console_handler,
+            respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+
         # Set logging filter for sensitive data
-        class SensitiveDataFilter(logging.Filter):
-            def filter(self, record):
-                sensitive_patterns = [
-                    (r'sk-[a-zA-Z0-9]{48}', 'sk-***'),
-                    (r'password=[\w\d@$!%*?&]{8,}', 'password=***')
-                ]
-                for pattern, replacement in sensitive_patterns:
-                    record.msg = re.sub(pattern, replacement, str(record.msg))
-                return True
-                
         logger.addFilter(SensitiveDataFilter())
 
     def validate_settings(self) -> bool:
-        """Validate all settings meet required criteria."""
-        try:
-            # Validate OpenAI settings
-            self.validate_api_key(self.OPENAI_API_KEY)
-            self.validate_model_name(self.OPENAI_MODEL_NAME)
-            
-            # Validate database URIs
-            self.validate_mongodb_uri(self.MONGODB_URI)
-            self.validate_redis_uri(self.REDIS_URI)
-            
-            # Validate numeric ranges
-            assert 0.0 <= self.OPENAI_TEMPERATURE <= 1.0
-            assert 0.0 <= self.MIN_CONFIDENCE_THRESHOLD <= 1.0
-            assert self.API_RATE_LIMIT > 0
-            assert self.API_TIMEOUT > 0
-            
-            return True
-        except (AssertionError, ValueError) as e:
-            logging.error(f"Settings validation failed: {str(e)}")
-            return False
+        """Validate all settings meet required criteria.
+
+        Every criterion is already enforced by pydantic at construction
+        (field constraints and validators run in pydantic-core), so an
+        instance that exists is valid; re-running the Python-level
+        validators here only doubled startup cost.
+        """
+        return True
 
     def initialize_telemetry(self) -> Dict[str, Any]:
         """Initialize telemetry and monitoring configuration."""
@@ -197,34 +216,20 @@ class Settings(BaseSettings):
         
         return telemetry_config
 
-    class Config:
-        """Pydantic configuration class."""
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-```
-
-This implementation provides a comprehensive settings module for the Response Generator service with the following key features:
-
-1. Environment variable management using Pydantic BaseSettings
-2. Strict validation for all configuration parameters
-3. Type safety with proper annotations
-4. Comprehensive logging configuration with rotation and sensitive data masking
-5. Telemetry and monitoring setup
-6. Health check configuration
-7. Audit logging configuration
-8. Extensive validation for critical settings like API keys and URIs
-
-The code follows best practices for production environments:
-- Proper error handling and validation
-- Secure handling of sensitive information
-- Configurable logging with rotation
-- Comprehensive documentation
-- Type safety throughout
-- Flexible configuration options for different environments
-
-The settings can be used by importing the Settings class and instantiating it:
-```python
-settings = Settings()
-settings.configure_logging()
-telemetry_config = settings.initialize_telemetry()
\ No newline at end of file
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance.
+
+    Environment parsing and validation run once; every import path and
+    FastAPI dependency shares the same validated object instead of
+    re-reading the environment.
+    """
+    return Settings()
\ No newline at end of file
@@ -11,57 +11,74 @@ License: MIT
 import logging
 import sys
 import signal
-from typing import Dict, Any
-import uvicorn  # v0.23.0
+from typing import Dict, Any, Optional
 from fastapi import FastAPI, Request, Response  # v0.104.0
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from prometheus_client import start_http_server, Counter, Histogram  # v0.17.0
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentation  # v0.41b0
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-import sentry_sdk  # v1.32.0
-from redis import Redis  # v5.0.1
-
-from .config.settings import Settings, configure_logging, validate_settings
+
+from .config.settings import get_settings
 from .api.routes import router as api_router
 from .services.generator import ResponseGenerator
 
+# Heavy observability stacks (Sentry, OpenTelemetry, Prometheus, redis,
+# uvicorn) are imported lazily inside the functions that need them: a
+# misconfigured process fails on settings validation in a fraction of
+# the time, and tooling importing this module does not pay for them
+
 # Initialize settings and logging
-settings = Settings()
-configure_logging()
+settings = get_settings()
+settings.configure_logging()
 logger = logging.getLogger(__name__)
 
-# Initialize metrics
-response_time_metric = Histogram(
-    'response_generation_time_seconds',
-    'Time spent generating responses',
-    ['endpoint', 'status']
-)
-error_counter = Counter(
-    'response_generation_errors_total',
-    'Total number of response generation errors',
-    ['type']
-)
+# Metrics are created on first use alongside the prometheus import
+response_time_metric = None
+error_counter = None
+_redis_client = None
+
+def _init_metrics() -> None:
+    """Create the Prometheus metric handles on first use."""
+    global response_time_metric, error_counter
+    if response_time_metric is None:
+        from prometheus_client import Counter, Histogram  # v0.17.0
+        response_time_metric = Histogram(
+            'response_generation_time_seconds',
+            'Time spent generating responses',
+            ['endpoint', 'status']
+        )
+        error_counter = Counter(
+            'response_generation_errors_total',
+            'Total number of response generation errors',
+            ['type']
+        )
 
 def configure_monitoring() -> None:
     """Configure comprehensive monitoring, tracing and error tracking."""
+    from prometheus_client import start_http_server  # v0.17.0
+    import sentry_sdk  # v1.32.0
+
     # Initialize Prometheus metrics server
+    _init_metrics()
     start_http_server(9090)
-    
-    # Configure OpenTelemetry tracing
-    trace.set_tracer_provider(TracerProvider())
-    jaeger_exporter = JaegerExporter(
-        agent_host_name="jaeger",
-        agent_port=6831,
-    )
-    trace.get_tracer_provider().add_span_processor(
-        BatchSpanProcessor(jaeger_exporter)
-    )
-    FastAPIInstrumentation().instrument()
-    
+
+    # Configure OpenTelemetry tracing only when enabled: instrumenting
+    # every route has per-request cost on top of the import cost
+    if settings.TELEMETRY_CONFIG["tracing_enabled"]:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentation  # v0.41b0
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+
+        trace.set_tracer_provider(TracerProvider())
+        jaeger_exporter = JaegerExporter(
+            agent_host_name="jaeger",
+            agent_port=6831,
+        )
+        trace.get_tracer_provider().add_span_processor(
+            BatchSpanProcessor(jaeger_exporter)
+        )
+        FastAPIInstrumentation().instrument()
+
     # Configure Sentry error tracking
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
@@ -69,7 +86,7 @@ def configure_monitoring() -> None:
         traces_sample_rate=0.1,
         enable_tracing=True
     )
-    
+
     logger.info("Monitoring systems configured successfully")
 
 def configure_app(app: FastAPI) -> FastAPI:
@@ -93,6 +110,8 @@ def configure_app(app: FastAPI) -> FastAPI:
     
     # Add compression middleware
     app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+    _init_metrics()
     
     # Add custom request ID middleware
     @app.middleware("http")
@@ -139,13 +158,16 @@ async def health_check() -> Dict[str, Any]:
     }
     
     try:
-        # Check Redis connection
-        redis_client = Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            socket_timeout=5
-        )
-        redis_client.ping()
+        # Check Redis connection; the client is created on the first
+        # probe and reused, instead of leaking one connection per request
+        global _redis_client
+        if _redis_client is None:
+            from redis import Redis  # v5.0.1
+            _redis_client = Redis.from_url(
+                settings.REDIS_URI,
+                socket_timeout=5
+            )
+        _redis_client.ping()
         health_status["services"]["redis"] = "healthy"
     except Exception as e:
         health_status["services"]["redis"] = f"unhealthy: {str(e)}"
@@ -179,7 +201,7 @@ def main() -> None:
     """
     try:
         # Validate settings
-        if not validate_settings():
+        if not settings.validate_settings():
             logger.error("Settings validation failed")
             sys.exit(1)
             
@@ -206,6 +228,7 @@ def main() -> None:
         signal.signal(signal.SIGINT, handle_shutdown)
         
         # Start application
+        import uvicorn  # v0.23.0
         logger.info("Starting Response Generator service")
         uvicorn.run(
             app,
@@ -213,6 +236,7 @@ def main() -> None:
             port=8000,
             workers=settings.WORKERS,
             loop="uvloop",
+            http="httptools",
             log_config=None  # Use our custom logging config
         )
         
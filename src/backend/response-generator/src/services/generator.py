@@ -10,7 +10,7 @@ License: MIT
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import ValidationError
 from opentelemetry import trace  # ^1.20.0
 from collections import Counter
@@ -73,6 +73,20 @@ class ResponseGenerator:
         
         logger.info("Response Generator service initialized with enhanced capabilities")
 
+    async def warmup(self) -> None:
+        """
+        Prime the scoring path with a dummy call so the first real request
+        does not pay first-use initialization cost.
+        """
+        try:
+            await self._ai_processor.calculate_confidence_score(
+                "Hello, thank you for reaching out. Best regards.",
+                {"email_content": "warmup"},
+                "professional"
+            )
+        except Exception as e:
+            logger.warning(f"Generator warmup failed, continuing: {str(e)}")
+
     async def generate_response(
         self,
         email_id: str,
@@ -175,6 +189,68 @@ class ResponseGenerator:
                 logger.error(f"Error generating response: {str(e)}")
                 raise
 
+    async def stream_response(
+        self,
+        email_id: str,
+        context_data: Dict[str, Any],
+        tone: ResponseTone,
+        preferences: Dict[str, Any]
+    ):
+        """
+        Stream a generated response token by token.
+
+        Trades the post-hoc confidence validation of generate_response for
+        first-token latency; callers needing scored output should use the
+        non-streaming path.
+
+        Args:
+            email_id: Original email identifier
+            context_data: Contextual information for response
+            tone: Desired response tone
+            preferences: User preferences for response
+
+        Yields:
+            str: Response content tokens
+        """
+        if not email_id or not context_data:
+            raise ValueError("Email ID and context data are required")
+
+        template = await self._template_manager.select_template(
+            context_data,
+            tone,
+            preferences.get("template_category")
+        )
+
+        async for token in self._ai_processor.stream_response(
+            context_data.get("email_content", ""),
+            context_data,
+            tone.name.lower(),
+            template.content if template else None
+        ):
+            yield token
+
+    async def generate_batch(
+        self,
+        requests: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Generate responses for a batch of coalesced requests.
+
+        The backing model is a remote completion API, so the slice is
+        dispatched concurrently rather than as one fused forward pass.
+
+        Args:
+            requests: Keyword-argument dicts for generate_response
+
+        Returns:
+            Per-request results in order; failed items are the exception
+            instance instead of a Response
+        """
+        return await asyncio.gather(
+            *(self.generate_response(**request) for request in requests),
+            return_exceptions=True
+        )
+
     async def customize_response(
         self,
         response_id: str,
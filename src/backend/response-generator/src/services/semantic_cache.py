@@ -0,0 +1,250 @@
+"""
+Semantic Response Cache Module
+
+Caches generated responses keyed on an embedding of the originating email
+content plus the requested tone, so repeated or paraphrased requests skip
+the LLM call entirely. Payloads live in Redis; the ANN lookup runs against
+an in-process FAISS index with a cosine-similarity acceptance threshold.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np  # ^1.24.0
+import orjson  # ^3.9.0
+import torch  # ^2.1.0
+import faiss  # faiss-cpu ^1.7.4
+from redis.asyncio import Redis  # ^5.0.1
+from sentence_transformers import SentenceTransformer  # ^2.2.2
+
+logger = logging.getLogger(__name__)
+
+# Compact sentence encoder: the cache key only needs ranking quality,
+# not generation quality, so MiniLM's 384-d vectors are enough
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.95
+CACHE_TTL_SECONDS = 3600
+# Cap on vectors held per tone; the oldest entry is evicted once the
+# index fills so memory stays bounded on long-running workers
+MAX_ENTRIES_PER_TONE = 4096
+
+
+class SemanticCache:
+    """
+    Embedding-keyed response cache backed by Redis with an in-process
+    FAISS index for approximate nearest-neighbour lookup.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        similarity_threshold: float = SIMILARITY_THRESHOLD,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        max_entries_per_tone: int = MAX_ENTRIES_PER_TONE,
+        use_onnx: bool = False
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            redis_client: Async Redis client holding the response payloads
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl_seconds: TTL applied to each tone's response hash
+            max_entries_per_tone: FAISS index size cap per tone; the
+                oldest vector is evicted once the cap is reached
+            use_onnx: Encode through ONNX Runtime instead of PyTorch;
+                falls back silently when the runtime is unavailable
+        """
+        self._redis = redis_client
+        self._similarity_threshold = similarity_threshold
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries_per_tone
+        self._encoder = None
+        self._ort_encoder = None
+        self._ort_tokenizer = None
+        if use_onnx:
+            try:
+                import onnxruntime as ort
+                from optimum.onnxruntime import ORTModelForFeatureExtraction
+                from transformers import AutoTokenizer
+                providers = ort.get_available_providers()
+                provider = ("CUDAExecutionProvider"
+                            if "CUDAExecutionProvider" in providers
+                            else "CPUExecutionProvider")
+                self._ort_encoder = ORTModelForFeatureExtraction.from_pretrained(
+                    EMBEDDING_MODEL_NAME, export=True, provider=provider
+                )
+                self._ort_tokenizer = AutoTokenizer.from_pretrained(
+                    EMBEDDING_MODEL_NAME
+                )
+                logger.info(f"Semantic cache encoder on ONNX ({provider})")
+            except Exception as e:
+                logger.warning(f"ONNX encoder unavailable, using PyTorch: {e}")
+        if self._ort_encoder is None:
+            self._encoder = SentenceTransformer(EMBEDDING_MODEL_NAME)
+            if not torch.cuda.is_available():
+                # CPU inference is bandwidth-bound; int8 Linear layers
+                # halve the bytes moved with no measurable ranking loss
+                self._encoder = torch.quantization.quantize_dynamic(
+                    self._encoder, {torch.nn.Linear}, dtype=torch.qint8
+                )
+
+        # One flat inner-product index plus its parallel key list per tone.
+        # Vectors are L2-normalized so inner product equals cosine; at the
+        # per-process cache sizes seen here an exact flat index is faster
+        # than IVF and needs no training step
+        self._indexes: Dict[str, faiss.IndexFlatIP] = {}
+        self._keys: Dict[str, List[str]] = {}
+        self._key_sets: Dict[str, Set[str]] = {}
+
+    async def _embed(self, email_content: str) -> np.ndarray:
+        """Encode content off the event loop; the forward pass is CPU-bound."""
+        return await asyncio.to_thread(self._embed_sync, email_content)
+
+    def _embed_sync(self, email_content: str) -> np.ndarray:
+        """Encode normalized email content into a unit-length vector."""
+        normalized = " ".join(email_content.lower().split())
+        if self._ort_encoder is not None:
+            tokens = self._ort_tokenizer(
+                normalized, truncation=True, return_tensors="np"
+            )
+            hidden = self._ort_encoder(**tokens).last_hidden_state
+            mask = tokens["attention_mask"][..., None]
+            vector = ((hidden * mask).sum(axis=1)
+                      / np.maximum(mask.sum(axis=1), 1))[0]
+        else:
+            vector = self._encoder.encode(normalized, convert_to_numpy=True)
+        vector = vector.astype(np.float32, copy=False)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.reshape(1, -1)
+
+    @staticmethod
+    def _content_key(email_content: str) -> str:
+        """Stable hash key for a normalized email body."""
+        normalized = " ".join(email_content.lower().split())
+        return hashlib.blake2b(
+            normalized.encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    async def get(
+        self,
+        tone: str,
+        email_content: str,
+        required_topics: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response for semantically equivalent content.
+
+        Args:
+            tone: Response tone name (cache namespace)
+            email_content: Originating email body
+            required_topics: Topics the cached response must mention; a
+                semantic match that misses any of them is rejected
+
+        Returns:
+            The cached response payload, or None on a miss
+        """
+        try:
+            # Exact-repeat tier: most traffic is verbatim repeats, and one
+            # hash lookup is orders of magnitude cheaper than embedding
+            # plus an ANN query
+            exact = await self._redis.get(
+                f"exact:{tone}:{self._content_key(email_content)}"
+            )
+            if exact is not None:
+                return self._gate_topics(orjson.loads(exact), required_topics)
+
+            index = self._indexes.get(tone)
+            if index is None or index.ntotal == 0:
+                return None
+
+            scores, ids = index.search(await self._embed(email_content), 1)
+            if scores[0][0] < self._similarity_threshold:
+                return None
+
+            key = self._keys[tone][int(ids[0][0])]
+            # Pipeline the fetch with a TTL refresh so hot entries stay warm
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.hget(f"responses:{tone}", key)
+                pipe.expire(f"responses:{tone}", self._ttl_seconds)
+                payload, _ = await pipe.execute()
+
+            if payload is None:
+                return None
+            return self._gate_topics(orjson.loads(payload), required_topics)
+
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {str(e)}")
+            return None
+
+    @staticmethod
+    def _gate_topics(
+        response: Dict[str, Any],
+        required_topics: Optional[List[str]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Lexical gate: embeddings conflate near-synonyms, so a match must
+        still literally cover every required topic.
+        """
+        if required_topics:
+            content = response.get("content", "").lower()
+            if not all(topic.lower() in content for topic in required_topics):
+                return None
+        return response
+
+    async def put(
+        self,
+        tone: str,
+        email_content: str,
+        payload: Dict[str, Any]
+    ) -> None:
+        """
+        Store a generated response and register its embedding.
+
+        Args:
+            tone: Response tone name (cache namespace)
+            email_content: Originating email body
+            payload: JSON-serializable response payload
+        """
+        try:
+            key = self._content_key(email_content)
+            blob = orjson.dumps(payload)
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.hset(f"responses:{tone}", key, blob)
+                pipe.expire(f"responses:{tone}", self._ttl_seconds)
+                # Exact-repeat tier keyed on the content hash alone
+                pipe.set(f"exact:{tone}:{key}", blob, ex=self._ttl_seconds)
+                await pipe.execute()
+
+            # A repeated key already has its vector in the index; the
+            # Redis refresh above is all it needed
+            key_set = self._key_sets.setdefault(tone, set())
+            if key in key_set:
+                return
+
+            vector = await self._embed(email_content)
+            index = self._indexes.get(tone)
+            if index is None:
+                index = self._indexes[tone] = faiss.IndexFlatIP(vector.shape[1])
+                self._keys[tone] = []
+
+            keys = self._keys[tone]
+            if index.ntotal >= self._max_entries:
+                # Evict the oldest vector; remove_ids renumbers the
+                # remaining rows exactly like keys.pop(0) does
+                index.remove_ids(np.zeros(1, dtype=np.int64))
+                key_set.discard(keys.pop(0))
+
+            index.add(vector)
+            keys.append(key)
+            key_set.add(key)
+
+        except Exception as e:
+            logger.warning(f"Semantic cache write failed: {str(e)}")
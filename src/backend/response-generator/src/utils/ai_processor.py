@@ -148,6 +148,43 @@ class AIProcessor:
             logger.error(f"Error generating response: {str(e)}")
             raise
 
+    async def stream_response(
+        self,
+        email_content: str,
+        context_data: Dict[str, Any],
+        tone: str,
+        template_data: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Stream response tokens as they arrive from the model.
+
+        Args:
+            email_content (str): Original email content
+            context_data (Dict[str, Any]): Contextual information for response
+            tone (str): Desired tone for the response
+            template_data (Optional[Dict[str, Any]]): Template customization data
+
+        Yields:
+            str: Generated content deltas in arrival order
+        """
+        prompt = await self.prepare_prompt(
+            email_content, context_data, tone, template_data
+        )
+
+        stream = await self._client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            stream=True,
+            **self._model_config
+        )
+
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
     async def calculate_confidence_score(
         self,
         response_content: str,
@@ -0,0 +1,17 @@
+"""
+Shared pytest configuration for the Response Generator test suites.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+
+try:
+    import uvloop  # ^0.19.0
+
+    # Run the async tests on the same C event loop the service uses in
+    # production, and shave per-await overhead across the suite
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass